@@ -29,8 +29,10 @@ IPv4_DUMMY_ADDRESS = "100.85.0.1/24"
 IPv4_DUMMY_GATEWAY = "100.85.0.1"
 IPv6_DUMMY_ADDRESS = "fdeb:446c:912d:08da::/64"
 IPv6_DUMMY_GATEWAY = "fdeb:446c:912d:08da::1"
+IPv6_KERNEL_SUPPORT_FILEPATH = "/proc/net/if_inet6"
 
 KILLSWITCH_DNS_PRIORITY_VALUE = "-1400"
+KILLSWITCH_NM_EVENTS_DRAIN_INTERVAL = 5
 VPN_DNS_PRIORITY_VALUE = -1500
 
 DEFAULT_KEYRING_SERVICE = "ProtonVPN"
@@ -78,6 +78,67 @@ class NMClientMixin:
         )
         self.main_loop.run()
 
+    def _wait_for_async_calls(self, async_calls):
+        """Dispatch NM async calls and wait until all of them complete.
+
+        Args:
+            async_calls (list(tuple)): async function, its arguments up to
+                and including the cancellable, and its finish function
+        Returns:
+            list(Exception): errors raised by the finish functions
+        """
+        if not async_calls:
+            return []
+
+        calls_state = dict(pending=len(async_calls), errors=[])
+
+        # Async callbacks are invoked on the thread default main context,
+        # which needs to be the one iterated by the loop.
+        main_context = self.main_loop.get_context()
+        main_context.push_thread_default()
+        try:
+            for async_function, args, finish_function in async_calls:
+                async_function(
+                    *args, self._on_async_call_finished,
+                    (finish_function, calls_state)
+                )
+        finally:
+            main_context.pop_thread_default()
+
+        self.main_loop.run()
+
+        return calls_state["errors"]
+
+    def _on_async_call_finished(self, source_object, result, data):
+        """Callback for dispatched NM async calls.
+
+        Args:
+            source_object (GObject.Object): object the call was made on
+            result (Gio.AsyncResult): function
+            data (tuple): finish function and state of the dispatched calls
+        """
+        finish_function, calls_state = data
+
+        try:
+            finish_function(source_object, result)
+        except Exception as e:
+            logger.exception("Exception: %s", e)
+            calls_state["errors"].append(e)
+
+        calls_state["pending"] -= 1
+        if not calls_state["pending"]:
+            self.main_loop.quit()
+
+    def _process_pending_events(self):
+        """Let the cached NM client catch up with NetworkManager.
+
+        NM.Client only updates its cache while the main context of the loop
+        is iterated, so any pending events are dispatched before a lookup.
+        """
+        context = self.main_loop.get_context()
+        while context.pending():
+            context.iteration(False)
+
     def __dynamic_callback(self, client, result, data):
         """Dynamic callback method.
 
@@ -1,6 +1,12 @@
+from socket import AF_INET6
+
 import dbus
+import gi
 from dbus.mainloop.glib import DBusGMainLoop
 
+gi.require_version("NM", "1.0")
+from gi.repository import NM
+
 from ... import exceptions
 from ...constants import (IPv6_DUMMY_ADDRESS, IPv6_DUMMY_GATEWAY,
                           IPv6_LEAK_PROTECTION_CONN_NAME,
@@ -8,10 +14,10 @@ from ...constants import (IPv6_DUMMY_ADDRESS, IPv6_DUMMY_GATEWAY,
 from ...enums import KillSwitchActionEnum, KillSwitchInterfaceTrackerEnum
 from ...logger import logger
 from ..dbus.dbus_network_manager_wrapper import NetworkManagerUnitWrapper
-from ..subprocess_wrapper import subprocess
+from .isolated_nm_client_mixin import IsolatedNMClientMixin
 
 
-class IPv6LeakProtection:
+class IPv6LeakProtection(IsolatedNMClientMixin):
     """Manages IPv6 leak protection connection/interfaces."""
     enable_ipv6_leak_protection = True
 
@@ -42,6 +48,7 @@ class IPv6LeakProtection:
             }
         }
         self.nm_wrapper = nm_wrapper(self.bus)
+        self._leak_protection_connection = self._build_leak_protection_connection() # noqa
         logger.info("Intialized IPv6 leak protection manager")
         self.get_status_connectivity_check()
 
@@ -51,7 +58,7 @@ class IPv6LeakProtection:
         Args:
             action (string): either enable or disable
         """
-        logger.info("Manage IPV6: {}".format(action))
+        logger.info("Manage IPV6: %s", action)
         self._ensure_connectivity_check_is_disabled()
         self.update_connection_status()
 
@@ -73,22 +80,6 @@ class IPv6LeakProtection:
     def add_leak_protection(self):
         """Add leak protection connection/interface."""
         logger.info("Adding IPv6 leak protection")
-        subprocess_command = [
-            "nmcli", "c", "a", "type", "dummy",
-            "ifname", IPv6_LEAK_PROTECTION_IFACE_NAME,
-            "con-name", IPv6_LEAK_PROTECTION_CONN_NAME,
-            "ipv6.method", "manual",
-            "ipv6.addresses", IPv6_DUMMY_ADDRESS,
-            "ipv6.gateway", IPv6_DUMMY_GATEWAY,
-            "ipv6.route-metric", "95",
-            # "ipv4.dns-priority", KILLSWITCH_DNS_PRIORITY_VALUE,
-            "ipv6.dns-priority", KILLSWITCH_DNS_PRIORITY_VALUE,
-            # "ipv4.ignore-auto-dns", "yes",
-            "ipv6.ignore-auto-dns", "yes",
-            # "ipv4.dns", "0.0.0.0",
-            "ipv6.dns", "::1"
-        ]
-
         if not self.interface_state_tracker[self.conn_name][
             KillSwitchInterfaceTrackerEnum.EXISTS
         ] or self.interface_state_tracker[self.conn_name][
@@ -97,126 +88,114 @@ class IPv6LeakProtection:
             KillSwitchInterfaceTrackerEnum.IS_RUNNING
         ]:
             self.manage(KillSwitchActionEnum.DISABLE)
-            self.run_subprocess(
-                exceptions.EnableIPv6LeakProtectionError,
-                "Unable to add IPv6 leak protection connection/interface",
-                subprocess_command
-            )
+            self._wait_for_async_calls([(
+                self.nm_client.add_connection_async,
+                [self._leak_protection_connection, True, None],
+                NM.Client.add_connection_finish
+            )])
+
+            self.update_connection_status()
+            if not self.interface_state_tracker[self.conn_name][
+                KillSwitchInterfaceTrackerEnum.EXISTS
+            ]:
+                logger.error(
+                    "Interface state tracker: %s", self.interface_state_tracker
+                )
+                raise exceptions.EnableIPv6LeakProtectionError(
+                    "Unable to add IPv6 leak protection connection/interface"
+                )
 
     def remove_leak_protection(self):
         """Remove leak protection connection/interface."""
         logger.info("Removing IPv6 leak protection")
-        subprocess_command = "nmcli c delete {}".format(
-            IPv6_LEAK_PROTECTION_CONN_NAME
-        ).split(" ")
-
         self.update_connection_status()
+        if not self.interface_state_tracker[self.conn_name][
+            KillSwitchInterfaceTrackerEnum.EXISTS
+        ]:
+            return
+
+        connection = self.nm_client.get_connection_by_id(self.conn_name)
+        if connection:
+            self._wait_for_async_calls([(
+                connection.delete_async, [None],
+                NM.RemoteConnection.delete_finish
+            )])
+            self.update_connection_status()
+
         if self.interface_state_tracker[self.conn_name][
             KillSwitchInterfaceTrackerEnum.EXISTS
         ]:
-            try:
-                self.run_subprocess(
-                    exceptions.DisableIPv6LeakProtectionError,
-                    "Unable to remove IPv6 leak protection connection/interface",
-                    subprocess_command
-                )
-            except exceptions.DisableIPv6LeakProtectionError as e:
-                logger.exception(e)
-                self.deactivate_connection()
+            logger.error(
+                "Unable to remove IPv6 leak protection connection/interface"
+            )
+            self.deactivate_connection()
 
     def deactivate_connection(self):
         """Deactivate a connection."""
         self.update_connection_status()
-        active_conn_dict = self.nm_wrapper.search_for_connection(
-            IPv6_LEAK_PROTECTION_CONN_NAME, is_active=True,
-            return_active_conn_path=True
-        )
-        if (
-            self.interface_state_tracker[IPv6_LEAK_PROTECTION_CONN_NAME][
-                KillSwitchInterfaceTrackerEnum.IS_RUNNING
-            ] and active_conn_dict
-        ):
-            active_conn_path = str(active_conn_dict.get("active_conn_path"))
-            try:
-                self.nm_wrapper.disconnect_connection(
-                    active_conn_path
-                )
-            except dbus.exceptions.DBusException as e:
-                logger.exception(e)
-                raise exceptions.DectivateKillswitchError(
-                    "Unable to deactivate {}".format(IPv6_LEAK_PROTECTION_CONN_NAME)
-                )
-
-    def run_subprocess(self, exception, exception_msg, *args):
-        """Run provided input via subprocess.
+        if not self.interface_state_tracker[self.conn_name][
+            KillSwitchInterfaceTrackerEnum.IS_RUNNING
+        ]:
+            return
 
-        Args:
-            exception (exceptions.IPv6LeakProtectionError):
-                exception based on action
-            exception_msg (string): exception message
-            *args (list): arguments to be passed to subprocess
-        """
-        subprocess_outpout = subprocess.run(
-            *args, stderr=subprocess.PIPE, stdout=subprocess.PIPE
-        )
+        for active_conn in self.nm_client.get_active_connections():
+            if active_conn.get_id() != self.conn_name:
+                continue
 
-        if (
-            subprocess_outpout.returncode != 0
-            and subprocess_outpout.returncode != 10
-        ):
-            logger.error(
-                "Interface state tracker: {}".format(
-                    self.interface_state_tracker
-                )
-            )
-            logger.error(
-                "{}: {}. Raising exception.".format(
-                    exception,
-                    subprocess_outpout
+            if self._wait_for_async_calls([(
+                self.nm_client.deactivate_connection_async,
+                [active_conn, None],
+                NM.Client.deactivate_connection_finish
+            )]):
+                raise exceptions.DectivateKillswitchError(
+                    "Unable to deactivate {}".format(self.conn_name)
                 )
-            )
-            raise exception(exception_msg)
+            return
 
     def update_connection_status(self):
         """Update connection/interface status."""
-        all_conns = self.nm_wrapper.get_all_connections()
-        active_conns = self.nm_wrapper.get_all_active_connections()
-
-        self.interface_state_tracker[self.conn_name][
-            KillSwitchInterfaceTrackerEnum.EXISTS
-        ] = False
-
-        self.interface_state_tracker[self.conn_name][
-            KillSwitchInterfaceTrackerEnum.IS_RUNNING
-        ] = False
+        self._process_pending_events()
+
+        self.interface_state_tracker[self.conn_name] = {
+            KillSwitchInterfaceTrackerEnum.EXISTS:
+            self.nm_client.get_connection_by_id(self.conn_name) is not None,
+            KillSwitchInterfaceTrackerEnum.IS_RUNNING: any(
+                active_conn.get_id() == self.conn_name
+                for active_conn in self.nm_client.get_active_connections()
+            )
+        }
 
-        for conn in all_conns:
-            try:
-                conn_name = str(self.nm_wrapper.get_settings_from_connection(
-                    conn
-                )["connection"]["id"])
-            except dbus.exceptions.DBusException:
-                conn_name = "None"
-
-            if conn_name in self.interface_state_tracker:
-                self.interface_state_tracker[conn_name][
-                    KillSwitchInterfaceTrackerEnum.EXISTS
-                ] = True
-
-        for active_conn in active_conns:
-            try:
-                conn_name = str(self.nm_wrapper.get_active_connection_properties(
-                    conn
-                )["connection"]["id"])
-            except dbus.exceptions.DBusException:
-                conn_name = "None"
+        logger.info("IPv6 status: %s", self.interface_state_tracker)
 
-            if conn_name in self.interface_state_tracker:
-                self.interface_state_tracker[conn_name][
-                    KillSwitchInterfaceTrackerEnum.IS_RUNNING
-                ] = True
+    def _build_leak_protection_connection(self):
+        """Build the IPv6 leak protection dummy connection profile.
 
-        logger.info("IPv6 status: {}".format(self.interface_state_tracker))
+        Returns:
+            NM.SimpleConnection
+        """
+        connection = NM.SimpleConnection.new()
+
+        conn_settings = NM.SettingConnection.new()
+        conn_settings.props.id = self.conn_name
+        conn_settings.props.uuid = NM.utils_uuid_generate()
+        conn_settings.props.type = NM.SETTING_DUMMY_SETTING_NAME
+        conn_settings.props.interface_name = self.iface_name
+
+        addr, prefix = self.ipv6_dummy_addrs.split("/")
+        ipv6_settings = NM.SettingIP6Config.new()
+        ipv6_settings.props.method = NM.SETTING_IP6_CONFIG_METHOD_MANUAL
+        ipv6_settings.add_address(NM.IPAddress.new(AF_INET6, addr, int(prefix)))
+        ipv6_settings.props.gateway = self.ipv6_dummy_gateway
+        ipv6_settings.props.route_metric = 95
+        ipv6_settings.props.dns_priority = int(KILLSWITCH_DNS_PRIORITY_VALUE)
+        ipv6_settings.props.ignore_auto_dns = True
+        ipv6_settings.add_dns("::1")
+
+        connection.add_setting(conn_settings)
+        connection.add_setting(NM.SettingDummy.new())
+        connection.add_setting(ipv6_settings)
+
+        return connection
 
     def _ensure_connectivity_check_is_disabled(self):
         conn_check = self.connectivity_check()
@@ -255,10 +234,8 @@ class IPv6LeakProtection:
         is_conn_check_enabled = nm_props["ConnectivityCheckEnabled"]
 
         logger.info(
-            "Conn check available ({}) - Conn check enabled ({})".format(
-                is_conn_check_available,
-                is_conn_check_enabled
-            )
+            "Conn check available (%s) - Conn check enabled (%s)",
+            is_conn_check_available, is_conn_check_enabled
         )
 
         return is_conn_check_available, is_conn_check_enabled
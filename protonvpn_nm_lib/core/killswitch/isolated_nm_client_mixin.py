@@ -0,0 +1,61 @@
+import gi
+
+gi.require_version("NM", "1.0")
+from gi.repository import NM, GLib
+
+from ...constants import KILLSWITCH_NM_EVENTS_DRAIN_INTERVAL
+from ..connection_backend.nm_client.nm_client_mixin import NMClientMixin
+
+
+def _new_nm_client(main_context):
+    """Create an NM client bound to the provided main context.
+
+    NM.Client delivers its events to the thread default main context
+    at the time it is created.
+
+    Args:
+        main_context (GLib.MainContext): context to bind the client to
+    Returns:
+        NM.Client
+    """
+    main_context.push_thread_default()
+    try:
+        return NM.Client.new(None)
+    finally:
+        main_context.pop_thread_default()
+
+
+def _drain_pending_events(main_context):
+    """Dispatch the NM client events queued in its main context.
+
+    Args:
+        main_context (GLib.MainContext): context the client is bound to
+    Returns:
+        bool: True, to keep the timeout source attached
+    """
+    while main_context.pending():
+        main_context.iteration(False)
+
+    return True
+
+
+class IsolatedNMClientMixin(NMClientMixin):
+    """NM client mixin bound to a dedicated GLib main context.
+
+    Killswitch managers are called from within the callers' own GLib
+    callbacks (ie: VPN state changes, daemon reconnector). With a dedicated
+    main context, waiting for NM only dispatches NM client events and never
+    re-enters the callers' pending sources, and quitting the loop after
+    an async NM call does not stop the caller's loop.
+
+    The dedicated context is otherwise only iterated during killswitch
+    calls, thus it is also drained periodically from the default main
+    context, so that NM signals do not pile up for the whole session.
+    """
+    main_context = GLib.MainContext.new()
+    nm_client = _new_nm_client(main_context)
+    main_loop = GLib.MainLoop.new(main_context, False)
+    drain_source_id = GLib.timeout_add_seconds(
+        KILLSWITCH_NM_EVENTS_DRAIN_INTERVAL,
+        _drain_pending_events, main_context
+    )
@@ -1,21 +1,100 @@
-from ipaddress import ip_network
+import os
+from functools import lru_cache
+from socket import AF_INET, AF_INET6, inet_pton
 
 import dbus
+import gi
 from dbus.mainloop.glib import DBusGMainLoop
 
+gi.require_version("NM", "1.0")
+from gi.repository import NM
+
 from ... import exceptions
 from ...constants import (KILLSWITCH_CONN_NAME, KILLSWITCH_INTERFACE_NAME,
                           ROUTED_CONN_NAME, ROUTED_INTERFACE_NAME,
                           IPv4_DUMMY_ADDRESS, IPv4_DUMMY_GATEWAY,
-                          IPv6_DUMMY_ADDRESS, IPv6_DUMMY_GATEWAY, KILLSWITCH_DNS_PRIORITY_VALUE)
+                          IPv6_DUMMY_ADDRESS, IPv6_DUMMY_GATEWAY,
+                          IPv6_KERNEL_SUPPORT_FILEPATH,
+                          KILLSWITCH_DNS_PRIORITY_VALUE)
 from ...enums import (KillSwitchActionEnum, KillSwitchInterfaceTrackerEnum,
                       KillswitchStatusEnum)
 from ...logger import logger
 from ..dbus.dbus_network_manager_wrapper import NetworkManagerUnitWrapper
-from ..subprocess_wrapper import subprocess
+from .isolated_nm_client_mixin import IsolatedNMClientMixin
+
+
+def _build_route_templates():
+    """Build the route templates used to exclude an IP from 0.0.0.0/0.
+
+    The subnet excluding an IP at a given prefix length keeps the IP
+    octets up to the one holding the prefix bit, flips that bit, and
+    zeroes the remaining octets.
+
+    Returns:
+        tuple(tuple(string, int, int, int, int)): for each prefix length,
+            the subnet address format string, the prefix length, the
+            index of the octet holding the prefix bit, the mask of the
+            octet bits to keep and the bit to flip
+    """
+    route_templates = []
+    for prefix in range(1, 33):
+        octet_index, bit_index = divmod(prefix - 1, 8)
+        route_templates.append((
+            ".".join(["%d"] * (octet_index + 1) + ["0"] * (3 - octet_index)),
+            prefix,
+            octet_index,
+            (0xFF << (7 - bit_index)) & 0xFF,
+            0x80 >> bit_index
+        ))
+
+    return tuple(route_templates)
+
+
+_ROUTE_TEMPLATES = _build_route_templates()
+
+
+@lru_cache(maxsize=64)
+def _exclude_from_ipv4_space(server_ip):
+    """Get the subnets covering 0.0.0.0/0 except for server_ip.
+
+    Equivalent to ip_network("0.0.0.0/0").address_exclude(), though
+    computed by filling in the precomputed route templates with the
+    server octets, from the largest to the smallest subnet. Results are
+    cached, as the same few servers are reconnected to over and over.
+
+    Args:
+        server_ip (string): IPv4 address, optionally in CIDR notation
+    Returns:
+        tuple(tuple(string, int)): subnets address and prefix length
+    Raises:
+        ValueError: if server_ip is not a valid IPv4 address or network
+    """
+    addr, _, prefix = server_ip.partition("/")
+    try:
+        prefix = int(prefix) if prefix else 32
+        octets = inet_pton(AF_INET, addr)
+    except (ValueError, OSError):
+        raise ValueError("{} is not a valid IPv4 network".format(server_ip))
+
+    if not 0 <= prefix <= 32:
+        raise ValueError("{} has an invalid prefix length".format(server_ip))
+    if int.from_bytes(octets, "big") & (0xFFFFFFFF >> prefix):
+        raise ValueError("{} has host bits set".format(server_ip))
+
+    return tuple(
+        (
+            template % (
+                tuple(octets[:octet_index])
+                + ((octets[octet_index] & keep_mask) ^ flip_bit,)
+            ),
+            subnet_prefix
+        )
+        for template, subnet_prefix, octet_index, keep_mask, flip_bit
+        in _ROUTE_TEMPLATES[:prefix]
+    )
 
 
-class KillSwitch:
+class KillSwitch(IsolatedNMClientMixin):
     # Additional loop needs to be create since SystemBus automatically
     # picks the default loop, which is intialized with the CLI.
     # Thus, to refrain SystemBus from using the default loop,
@@ -45,8 +124,13 @@ class KillSwitch:
         self.ipv4_dummy_gateway = ipv4_dummy_gateway
         self.ipv6_dummy_addrs = ipv6_dummy_addrs
         self.ipv6_dummy_gateway = ipv6_dummy_gateway
+        # Without kernel IPv6 support there is no IPv6 traffic to block,
+        # thus IPv6 is ignored on the dummy interfaces instead.
+        self.is_ipv6_available = os.path.isfile(IPv6_KERNEL_SUPPORT_FILEPATH)
         self.nm_wrapper = nm_wrapper(self.bus)
-        self.interface_state_tracker = {
+        self._status_dirty = True
+        self._is_tracker_synced = False
+        self._interface_state_tracker = {
             self.ks_conn_name: {
                 KillSwitchInterfaceTrackerEnum.EXISTS: False,
                 KillSwitchInterfaceTrackerEnum.IS_RUNNING: False
@@ -57,8 +141,27 @@ class KillSwitch:
             }
         }
 
+        self._ks_connection = self._build_dummy_connection(
+            self.ks_conn_name, self.ks_interface_name,
+            [self._split_cidr(self.ipv4_dummy_addrs)],
+            ipv4_gateway=self.ipv4_dummy_gateway,
+            route_metric=98
+        )
+
         logger.info("Initialized killswitch manager")
-        self.get_status_connectivity_check()
+
+    @property
+    def interface_state_tracker(self):
+        """Get connection/interface state tracker.
+
+        The tracker is synced from NetworkManager on first access.
+        """
+        if not self._is_tracker_synced:
+            self._is_tracker_synced = True
+            self._subscribe_to_connection_changes()
+            self._sync_connection_status()
+
+        return self._interface_state_tracker
 
     def manage(self, action, server_ip=None):
         """Manage killswitch.
@@ -69,11 +172,7 @@ class KillSwitch:
                 if so, then action is int
             server_ip (string): server ip to be connected to
         """
-        logger.info(
-            "Manage Killswitch action: {}".format(
-                action,
-            )
-        )
+        logger.info("Manage Killswitch action: %s", action)
 
         self._ensure_connectivity_check_is_disabled()
 
@@ -90,11 +189,7 @@ class KillSwitch:
         }[action](server_ip)
 
     def update_from_user_configuration_menu(self, action):
-        logger.info(
-            "Update from menu killswitch action: {}".format(
-                action,
-            )
-        )
+        logger.info("Update from menu killswitch action: %s", action)
 
         self._ensure_connectivity_check_is_disabled()
         self.update_connection_status()
@@ -128,7 +223,7 @@ class KillSwitch:
             server_ip (list | string): Proton VPN server IP
             pre_attempts (int): number of setup attempts
         """
-        self.update_connection_status()
+        self._refresh_connection_status()
 
         if pre_attempts >= 5:
             raise exceptions.KillswitchError(
@@ -136,7 +231,7 @@ class KillSwitch:
                 "Exceeded maximum attempts."
             )
 
-        logger.info("Pre-setup attempts: {}".format(pre_attempts))
+        logger.info("Pre-setup attempts: %s", pre_attempts)
 
         # happy path
         if (
@@ -190,15 +285,13 @@ class KillSwitch:
         pre_attempts += 1
         self.setup_pre_connection_ks(server_ip, pre_attempts=pre_attempts)
 
-    def setup_post_connection_ks(
-        self, _, post_attempts=0, activating_soft_connection=False
-    ):
+    def setup_post_connection_ks(self, _, post_attempts=0):
         """Assure post-connection Kill Switch is setup correctly.
 
         Args:
             post_attempts (int): number of setup attempts
         """
-        self.update_connection_status()
+        self._refresh_connection_status()
 
         if post_attempts >= 5:
             raise exceptions.KillswitchError(
@@ -206,7 +299,7 @@ class KillSwitch:
                 "Exceeded maximum attempts."
             )
 
-        logger.info("Post-setup attempts: {}".format(post_attempts))
+        logger.info("Post-setup attempts: %s", post_attempts)
 
         # happy path
         if (
@@ -221,19 +314,6 @@ class KillSwitch:
             self.activate_connection(self.ks_conn_name)
             self.delete_connection(self.routed_conn_name)
 
-            return
-        elif (
-            activating_soft_connection
-            and (
-                not self.interface_state_tracker[self.routed_conn_name][
-                    KillSwitchInterfaceTrackerEnum.IS_RUNNING
-                ] or not self.interface_state_tracker[self.routed_conn_name][
-                    KillSwitchInterfaceTrackerEnum.EXISTS
-                ]
-            )
-        ):
-            logger.info("Following happy path for soft-connection post setup")
-            self.activate_connection(self.ks_conn_name)
             return
         elif (
             self.interface_state_tracker[self.ks_conn_name][
@@ -269,46 +349,28 @@ class KillSwitch:
             raise Exception("Routed connection does not exist")
 
         post_attempts += 1
-        self.setup_post_connection_ks(
-            _, post_attempts=post_attempts,
-            activating_soft_connection=activating_soft_connection
-        )
+        self.setup_post_connection_ks(_, post_attempts=post_attempts)
 
     def setup_soft_connection(self, _):
-        """Setup Kill Switch for --on setting."""
+        """Setup Kill Switch for --on setting.
+
+        Whatever the current state, the soft connection always ends up with
+        the killswitch connection running and the routed one removed, thus
+        this is done directly instead of going through the post-connection
+        setup.
+        """
         self.create_killswitch_connection()
-        self.setup_post_connection_ks(None, activating_soft_connection=True)
+        self.activate_connection(self.ks_conn_name)
+        self.delete_connection(self.routed_conn_name)
 
     def create_killswitch_connection(self):
         """Create killswitch connection/interface."""
-        subprocess_command = [
-            "nmcli", "c", "a", "type", "dummy",
-            "ifname", self.ks_interface_name,
-            "con-name", self.ks_conn_name,
-            "ipv4.method", "manual",
-            "ipv4.addresses", self.ipv4_dummy_addrs,
-            "ipv4.gateway", self.ipv4_dummy_gateway,
-            "ipv6.method", "manual",
-            "ipv6.addresses", self.ipv6_dummy_addrs,
-            "ipv6.gateway", self.ipv6_dummy_gateway,
-            "ipv4.route-metric", "98",
-            "ipv6.route-metric", "98",
-            "ipv4.dns-priority", KILLSWITCH_DNS_PRIORITY_VALUE,
-            "ipv6.dns-priority", KILLSWITCH_DNS_PRIORITY_VALUE,
-            "ipv4.ignore-auto-dns", "yes",
-            "ipv6.ignore-auto-dns", "yes",
-            "ipv4.dns", "0.0.0.0",
-            "ipv6.dns", "::1"
-        ]
-        self.update_connection_status()
-        if not self.interface_state_tracker[self.ks_conn_name][
-            KillSwitchInterfaceTrackerEnum.EXISTS
-        ]:
-            self.create_connection(
-                self.ks_conn_name,
-                "Unable to activate {}".format(self.ks_conn_name),
-                subprocess_command, exceptions.CreateBlockingKillswitchError
-            )
+        self.create_connection(
+            self.ks_conn_name,
+            "Unable to activate {}".format(self.ks_conn_name),
+            self._ks_connection,
+            exceptions.CreateBlockingKillswitchError
+        )
 
     def create_routed_connection(self, server_ip, try_route_addrs=False):
         """Create routed connection/interface.
@@ -319,80 +381,69 @@ class KillSwitch:
         if isinstance(server_ip, list):
             server_ip = server_ip.pop()
 
-        subnet_list = list(ip_network('0.0.0.0/0').address_exclude(
-            ip_network(server_ip)
-        ))
-
-        route_data = [str(ipv4) for ipv4 in subnet_list]
-        route_data_str = ",".join(route_data)
-
-        subprocess_command = [
-            "nmcli", "c", "a", "type", "dummy",
-            "ifname", self.routed_interface_name,
-            "con-name", self.routed_conn_name,
-            "ipv4.method", "manual",
-            "ipv4.addresses", self.ipv4_dummy_addrs,
-            "ipv6.method", "manual",
-            "ipv6.addresses", self.ipv6_dummy_addrs,
-            "ipv6.gateway", self.ipv6_dummy_gateway,
-            "ipv4.route-metric", "97",
-            "ipv6.route-metric", "97",
-            "ipv4.routes", route_data_str,
-            "ipv4.dns-priority", KILLSWITCH_DNS_PRIORITY_VALUE,
-            "ipv6.dns-priority", KILLSWITCH_DNS_PRIORITY_VALUE,
-            "ipv4.ignore-auto-dns", "yes",
-            "ipv6.ignore-auto-dns", "yes",
-            "ipv4.dns", "0.0.0.0",
-            "ipv6.dns", "::1"
-        ]
+        route_data = _exclude_from_ipv4_space(server_ip)
 
         if try_route_addrs:
-            subprocess_command = [
-                "nmcli", "c", "a", "type", "dummy",
-                "ifname", self.routed_interface_name,
-                "con-name", self.routed_conn_name,
-                "ipv4.method", "manual",
-                "ipv4.addresses", route_data_str,
-                "ipv6.method", "manual",
-                "ipv6.addresses", self.ipv6_dummy_addrs,
-                "ipv6.gateway", self.ipv6_dummy_gateway,
-                "ipv4.route-metric", "97",
-                "ipv6.route-metric", "97",
-                "ipv4.dns-priority", KILLSWITCH_DNS_PRIORITY_VALUE,
-                "ipv6.dns-priority", KILLSWITCH_DNS_PRIORITY_VALUE,
-                "ipv4.ignore-auto-dns", "yes",
-                "ipv6.ignore-auto-dns", "yes",
-                "ipv4.dns", "0.0.0.0",
-                "ipv6.dns", "::1"
-            ]
+            connection = self._build_dummy_connection(
+                self.routed_conn_name, self.routed_interface_name,
+                route_data, route_metric=97
+            )
+        else:
+            connection = self._build_dummy_connection(
+                self.routed_conn_name, self.routed_interface_name,
+                [self._split_cidr(self.ipv4_dummy_addrs)],
+                ipv4_routes=route_data,
+                route_metric=97
+            )
 
-        logger.info(subprocess_command)
+        logger.info(route_data)
         exception_msg = "Unable to activate {}".format(self.routed_conn_name)
 
         try:
             self.create_connection(
                 self.routed_conn_name, exception_msg,
-                subprocess_command, exceptions.CreateRoutedKillswitchError
+                connection, exceptions.CreateRoutedKillswitchError
             )
         except exceptions.CreateRoutedKillswitchError as e:
-            if e.additional_context.returncode == 2 and not try_route_addrs:
+            if not try_route_addrs:
                 return self.create_routed_connection(server_ip, True)
             else:
-                raise exceptions.CreateRoutedKillswitchError(exception_msg)
+                raise exceptions.CreateRoutedKillswitchError(
+                    exception_msg, e.additional_context
+                )
 
     def create_connection(
         self, conn_name, exception_msg,
-        subprocess_command, exception
+        connection, exception
     ):
+        """Add a connection profile to NetworkManager.
+
+        Args:
+            conn_name (string): connection name (uid)
+            exception_msg (string): exception message
+            connection (NM.SimpleConnection): connection to be added
+            exception (exceptions.KillswitchError): exception based on action
+        """
+        self._refresh_connection_status()
+        if self.interface_state_tracker[conn_name][
+            KillSwitchInterfaceTrackerEnum.EXISTS
+        ]:
+            return
+
+        errors = self._wait_for_async_calls([(
+            self.nm_client.add_connection_async, [connection, True, None],
+            NM.Client.add_connection_finish
+        )])
+
         self.update_connection_status()
-        if not self.interface_state_tracker[conn_name][
+        if errors or not self.interface_state_tracker[conn_name][
             KillSwitchInterfaceTrackerEnum.EXISTS
         ]:
-            self.run_subprocess(
-                exception,
-                exception_msg,
-                subprocess_command
+            logger.error(
+                "%s: Connection %s was not added: %s. Raising exception.",
+                exception, conn_name, errors
             )
+            raise exception(exception_msg, errors)
 
     def activate_connection(self, conn_name):
         """Activate a connection based on connection name.
@@ -400,42 +451,37 @@ class KillSwitch:
         Args:
             conn_name (string): connection name (uid)
         """
-        self.update_connection_status()
-        conn_dict = self.nm_wrapper.search_for_connection( # noqa
-            conn_name,
-            return_device_path=True,
-            return_settings_path=True
-        )
+        self._refresh_connection_status()
         if (
-            self.interface_state_tracker[conn_name][
+            not self.interface_state_tracker[conn_name][
                 KillSwitchInterfaceTrackerEnum.EXISTS
             ]
-        ) and (
-            not self.interface_state_tracker[conn_name][
+        ) or (
+            self.interface_state_tracker[conn_name][
                 KillSwitchInterfaceTrackerEnum.IS_RUNNING
             ]
-        ) and conn_dict:
-            device_path = str(conn_dict.get("device_path"))
-            settings_path = str(conn_dict.get("settings_path"))
+        ):
+            return
 
-            try:
-                active_conn = self.nm_wrapper.activate_connection(
-                    settings_path, device_path
-                )
-            except dbus.exceptions.DBusException as e:
-                logger.exception(e)
-                raise exceptions.ActivateKillswitchError(
-                    "Unable to activate {}".format(conn_name)
-                )
-            else:
-                if active_conn:
-                    return
-                logger.error(
-                    "Dbus returned empty, unable to activate connection"
-                )
-                raise exceptions.ActivateKillswitchError(
-                    "Unable to activate {}".format(conn_name)
-                )
+        errors = []
+        connection = self._get_remote_connection(conn_name)
+        if connection:
+            errors = self._wait_for_async_calls([(
+                self.nm_client.activate_connection_async,
+                [connection, None, None, None],
+                NM.Client.activate_connection_finish
+            )])
+            self.update_connection_status()
+
+        if errors or not self.interface_state_tracker[conn_name][
+            KillSwitchInterfaceTrackerEnum.IS_RUNNING
+        ]:
+            logger.error(
+                "NetworkManager did not activate %s: %s", conn_name, errors
+            )
+            raise exceptions.ActivateKillswitchError(
+                "Unable to activate {}".format(conn_name), errors
+            )
 
     def deactivate_connection(self, conn_name):
         """Deactivate a connection based on connection name.
@@ -443,124 +489,301 @@ class KillSwitch:
         Args:
             conn_name (string): connection name (uid)
         """
-        self.update_connection_status()
-        active_conn_dict = self.nm_wrapper.search_for_connection( # noqa
-            conn_name, is_active=True,
-            return_active_conn_path=True
-        )
-        if (
-            self.interface_state_tracker[conn_name][
-                KillSwitchInterfaceTrackerEnum.IS_RUNNING
-            ] and active_conn_dict
-        ):
-            active_conn_path = str(active_conn_dict.get("active_conn_path"))
-            try:
-                self.nm_wrapper.disconnect_connection(
-                    active_conn_path
-                )
-            except dbus.exceptions.DBusException as e:
-                logger.exception(e)
-                raise exceptions.DectivateKillswitchError(
-                    "Unable to deactivate {}".format(conn_name)
-                )
+        self._refresh_connection_status()
+        if not self.interface_state_tracker[conn_name][
+            KillSwitchInterfaceTrackerEnum.IS_RUNNING
+        ]:
+            return
+
+        active_conn = self._get_active_connection(conn_name)
+        if not active_conn:
+            return
+
+        errors = self._wait_for_async_calls([(
+            self.nm_client.deactivate_connection_async, [active_conn, None],
+            NM.Client.deactivate_connection_finish
+        )])
+        if errors:
+            logger.error(
+                "NetworkManager did not deactivate %s: %s", conn_name, errors
+            )
+            raise exceptions.DectivateKillswitchError(
+                "Unable to deactivate {}".format(conn_name), errors
+            )
 
     def delete_connection(self, conn_name):
         """Delete a connection based on connection name.
 
-        If it fails to delete the connection, it will attempt to deactivate it.
-
         Args:
             conn_name (string): connection name (uid)
         """
-        subprocess_command = ""\
-            "nmcli c delete {}".format(conn_name).split(" ")
+        self._refresh_connection_status()
+        if not self.interface_state_tracker[conn_name][
+            KillSwitchInterfaceTrackerEnum.EXISTS
+        ]:
+            return
 
-        self.update_connection_status()
-        if self.interface_state_tracker[conn_name][KillSwitchInterfaceTrackerEnum.EXISTS]: # noqa
-            self.run_subprocess(
-                exceptions.DeleteKillswitchError,
-                "Unable to delete {}".format(conn_name),
-                subprocess_command
+        connection = self._get_remote_connection(conn_name)
+        if connection:
+            self._wait_for_async_calls([(
+                connection.delete_async, [None],
+                NM.RemoteConnection.delete_finish
+            )])
+            self.update_connection_status()
+
+        if self.interface_state_tracker[conn_name][
+            KillSwitchInterfaceTrackerEnum.EXISTS
+        ]:
+            logger.error(
+                "Interface state tracker: %s", self.interface_state_tracker
+            )
+            raise exceptions.DeleteKillswitchError(
+                "Unable to delete {}".format(conn_name)
             )
 
     def deactivate_all_connections(self):
-        """Deactivate all connections."""
-        self.deactivate_connection(self.ks_conn_name)
-        self.deactivate_connection(self.routed_conn_name)
+        """Deactivate all connections within a single NM dispatch."""
+        self.update_connection_status()
+
+        async_calls = []
+        for conn_name in [self.ks_conn_name, self.routed_conn_name]:
+            if not self.interface_state_tracker[conn_name][
+                KillSwitchInterfaceTrackerEnum.IS_RUNNING
+            ]:
+                continue
+
+            active_conn = self._get_active_connection(conn_name)
+            if active_conn:
+                async_calls.append((
+                    self.nm_client.deactivate_connection_async,
+                    [active_conn, None],
+                    NM.Client.deactivate_connection_finish
+                ))
+
+        errors = self._wait_for_async_calls(async_calls)
+        if errors:
+            logger.error(
+                "NetworkManager did not deactivate killswitch connections: %s",
+                errors
+            )
+            raise exceptions.DectivateKillswitchError(
+                "Unable to deactivate killswitch connections", errors
+            )
 
     def delete_all_connections(self, _=None):
-        """Delete all connections."""
-        self.delete_connection(self.ks_conn_name)
-        self.delete_connection(self.routed_conn_name)
+        """Delete all connections within a single NM dispatch."""
+        self.update_connection_status()
+
+        conn_names = [
+            conn_name
+            for conn_name in [self.ks_conn_name, self.routed_conn_name]
+            if self.interface_state_tracker[conn_name][
+                KillSwitchInterfaceTrackerEnum.EXISTS
+            ]
+        ]
+        if not conn_names:
+            return
+
+        async_calls = []
+        for conn_name in conn_names:
+            connection = self._get_remote_connection(conn_name)
+            if connection:
+                async_calls.append((
+                    connection.delete_async, [None],
+                    NM.RemoteConnection.delete_finish
+                ))
+
+        self._wait_for_async_calls(async_calls)
+
+        self.update_connection_status()
+        for conn_name in conn_names:
+            if self.interface_state_tracker[conn_name][
+                KillSwitchInterfaceTrackerEnum.EXISTS
+            ]:
+                logger.error(
+                    "Interface state tracker: %s", self.interface_state_tracker
+                )
+                raise exceptions.DeleteKillswitchError(
+                    "Unable to delete {}".format(conn_name)
+                )
 
     def update_connection_status(self):
         """Update connection/interface status."""
-        all_conns = self.nm_wrapper.get_all_connections()
-        active_conns = self.nm_wrapper.get_all_active_connections()
-        self.interface_state_tracker[self.ks_conn_name][KillSwitchInterfaceTrackerEnum.EXISTS] = False # noqa
-        self.interface_state_tracker[self.routed_conn_name][KillSwitchInterfaceTrackerEnum.EXISTS] = False  # noqa
-        self.interface_state_tracker[self.ks_conn_name][KillSwitchInterfaceTrackerEnum.IS_RUNNING] = False # noqa
-        self.interface_state_tracker[self.routed_conn_name][KillSwitchInterfaceTrackerEnum.IS_RUNNING] = False  # noqa
-
-        for conn in all_conns:
-            try:
-                conn_name = str(self.nm_wrapper.get_settings_from_connection(
-                    conn
-                )["connection"]["id"])
-            except dbus.exceptions.DBusException:
-                conn_name = "None"
-
-            if conn_name in self.interface_state_tracker:
-                self.interface_state_tracker[conn_name][
-                    KillSwitchInterfaceTrackerEnum.EXISTS
-                ] = True
+        self._status_dirty = True
+        self._refresh_connection_status()
+
+    def _refresh_connection_status(self):
+        """Refresh connection/interface status if it might have changed.
+
+        The tracker is kept up to date by the NM client signal handlers,
+        thus only pending NM events need to be dispatched. Events are
+        dispatched once per public call, unless a signal handler reported
+        a change in the meantime. Only use it for reads before a change;
+        results of a change must be checked with update_connection_status,
+        as the NM events reporting it might still be pending.
+        """
+        if not self._status_dirty:
+            return
 
-        for active_conn in active_conns:
-            try:
-                conn_name = str(self.nm_wrapper.get_active_connection_properties(
-                    active_conn
-                )["Id"])
-            except dbus.exceptions.DBusException:
-                conn_name = "None"
-
-            if conn_name in self.interface_state_tracker:
-                self.interface_state_tracker[conn_name][
-                    KillSwitchInterfaceTrackerEnum.IS_RUNNING
-                ] = True
+        self._process_pending_events()
+        self._status_dirty = False
+        logger.info("Tracker info: %s", self.interface_state_tracker)
 
-        logger.info("Tracker info: {}".format(self.interface_state_tracker))
+    def _sync_connection_status(self, conn_names=None):
+        """Sync connection/interface status from the NM client cache.
 
-    def run_subprocess(self, exception, exception_msg, *args):
-        """Run provided input via subprocess.
+        Only the tracked connections are looked up, by id, so that
+        properties of unrelated connections are never read.
 
         Args:
-            exception (exceptions.KillswitchError): exception based on action
-            exception_msg (string): exception message
-            *args (list): arguments to be passed to subprocess
+            conn_names (list(string)): connection names (uid) to be synced,
+                all tracked connections if not provided
         """
-        subprocess_outpout = subprocess.run(
-            *args, stderr=subprocess.PIPE, stdout=subprocess.PIPE
-        )
+        if conn_names is None:
+            conn_names = [self.ks_conn_name, self.routed_conn_name]
 
-        if (
-            subprocess_outpout.returncode != 0
-            and subprocess_outpout.returncode != 10
-        ):
-            logger.error(
-                "Interface state tracker: {}".format(
-                    self.interface_state_tracker
-                )
+        active_conn_ids = {
+            active_conn.get_id()
+            for active_conn in self.nm_client.get_active_connections()
+        }
+
+        for conn_name in conn_names:
+            self._interface_state_tracker[conn_name] = {
+                KillSwitchInterfaceTrackerEnum.EXISTS:
+                self.nm_client.get_connection_by_id(conn_name) is not None,
+                KillSwitchInterfaceTrackerEnum.IS_RUNNING:
+                conn_name in active_conn_ids
+            }
+
+    def _subscribe_to_connection_changes(self):
+        """Keep the tracker updated through NM client signals."""
+        for signal in [
+            "connection-added", "connection-removed",
+            "active-connection-added", "active-connection-removed"
+        ]:
+            self.nm_client.connect(signal, self._on_connection_change)
+        self.nm_client.connect("notify::nm-running", self._on_nm_running_change)
+
+    def _on_nm_running_change(self, client, pspec):
+        """NetworkManager started/stopped signal handler.
+
+        The NM client cache is emptied or repopulated as a whole when
+        NetworkManager restarts, thus the tracker is fully synced.
+
+        Args:
+            client (NM.Client): nm client object
+            pspec (GObject.ParamSpec): changed property
+        """
+        logger.info("NetworkManager running: %s", client.get_nm_running())
+        self._sync_connection_status()
+        self._status_dirty = True
+
+    def _on_connection_change(self, client, conn):
+        """Connection added/removed signal handler.
+
+        The entry is recomputed from the NM client cache rather than
+        derived from the signal, as events might be out of order
+        (ie: a profile being re-activated) or refer to another connection
+        with the same id.
+
+        Args:
+            client (NM.Client): nm client object
+            conn (NM.RemoteConnection|NM.ActiveConnection): connection
+        """
+        conn_name = conn.get_id()
+        if conn_name in self.interface_state_tracker:
+            self._sync_connection_status([conn_name])
+            self._status_dirty = True
+
+    def _build_dummy_connection(
+        self, conn_name, interface_name, ipv4_addrs,
+        ipv4_routes=(), ipv4_gateway=None, route_metric=98
+    ):
+        """Build a dummy connection profile.
+
+        Args:
+            conn_name (string): connection name (uid)
+            interface_name (string): interface name
+            ipv4_addrs (list(tuple(string, int))): IPv4 addresses and
+                their prefix length
+            ipv4_routes (list(tuple(string, int))): IPv4 routes
+                destination and prefix length
+            ipv4_gateway (string): IPv4 gateway
+            route_metric (int): IPv4 and IPv6 route metric
+        Returns:
+            NM.SimpleConnection
+        """
+        connection = NM.SimpleConnection.new()
+
+        conn_settings = NM.SettingConnection.new()
+        conn_settings.props.id = conn_name
+        conn_settings.props.uuid = NM.utils_uuid_generate()
+        conn_settings.props.type = NM.SETTING_DUMMY_SETTING_NAME
+        conn_settings.props.interface_name = interface_name
+
+        ipv4_settings = NM.SettingIP4Config.new()
+        ipv4_settings.props.method = NM.SETTING_IP4_CONFIG_METHOD_MANUAL
+        for addr, prefix in ipv4_addrs:
+            ipv4_settings.add_address(NM.IPAddress.new(AF_INET, addr, prefix))
+        for dest, prefix in ipv4_routes:
+            ipv4_settings.add_route(
+                NM.IPRoute.new(AF_INET, dest, prefix, None, -1)
             )
-            logger.error(
-                "{}: {}. Raising exception.".format(
-                    exception,
-                    subprocess_outpout
+        if ipv4_gateway:
+            ipv4_settings.props.gateway = ipv4_gateway
+        ipv4_settings.add_dns("0.0.0.0")
+
+        ipv6_settings = NM.SettingIP6Config.new()
+        if self.is_ipv6_available:
+            ipv6_settings.props.method = NM.SETTING_IP6_CONFIG_METHOD_MANUAL
+            ipv6_settings.add_address(
+                NM.IPAddress.new(
+                    AF_INET6, *self._split_cidr(self.ipv6_dummy_addrs)
                 )
             )
-            raise exception(
-                exception_msg,
-                subprocess_outpout
-            )
+            ipv6_settings.props.gateway = self.ipv6_dummy_gateway
+            ipv6_settings.add_dns("::1")
+            ip_settings_list = [ipv4_settings, ipv6_settings]
+        else:
+            ipv6_settings.props.method = NM.SETTING_IP6_CONFIG_METHOD_IGNORE
+            ip_settings_list = [ipv4_settings]
+
+        for ip_settings in ip_settings_list:
+            ip_settings.props.route_metric = route_metric
+            ip_settings.props.dns_priority = int(KILLSWITCH_DNS_PRIORITY_VALUE)
+            ip_settings.props.ignore_auto_dns = True
+
+        connection.add_setting(conn_settings)
+        connection.add_setting(NM.SettingDummy.new())
+        connection.add_setting(ipv4_settings)
+        connection.add_setting(ipv6_settings)
+
+        return connection
+
+    def _split_cidr(self, cidr):
+        """Split CIDR notation into address and prefix.
+
+        Args:
+            cidr (string): address in CIDR notation, ie: 10.0.0.1/24
+        Returns:
+            tuple(string, int)
+        """
+        addr, prefix = cidr.split("/")
+        return addr, int(prefix)
+
+    def _get_remote_connection(self, conn_name):
+        """Get NM.RemoteConnection based on connection name."""
+        self._refresh_connection_status()
+        return self.nm_client.get_connection_by_id(conn_name)
+
+    def _get_active_connection(self, conn_name):
+        """Get NM.ActiveConnection based on connection name."""
+        self._refresh_connection_status()
+        for active_conn in self.nm_client.get_active_connections():
+            if active_conn.get_id() == conn_name:
+                return active_conn
+
+        return None
 
     def _ensure_connectivity_check_is_disabled(self):
         conn_check = self.connectivity_check()
@@ -593,16 +816,18 @@ class KillSwitch:
         return is_conn_check_available, is_conn_check_enabled
 
     def get_status_connectivity_check(self):
-        """Check status of NM connectivity check."""
-        nm_props = self.nm_wrapper.get_network_manager_properties()
-        is_conn_check_available = nm_props["ConnectivityCheckAvailable"]
-        is_conn_check_enabled = nm_props["ConnectivityCheckEnabled"]
+        """Check status of NM connectivity check.
+
+        Status is read from the NM client cache, which is kept up to date
+        through NM signals, instead of querying NetworkManager properties.
+        """
+        self._process_pending_events()
+        is_conn_check_available = self.nm_client.connectivity_check_get_available() # noqa
+        is_conn_check_enabled = self.nm_client.connectivity_check_get_enabled()
 
         logger.info(
-            "Conn check available ({}) - Conn check enabled ({})".format(
-                is_conn_check_available,
-                is_conn_check_enabled
-            )
+            "Conn check available (%s) - Conn check enabled (%s)",
+            is_conn_check_available, is_conn_check_enabled
         )
 
         return is_conn_check_available, is_conn_check_enabled
@@ -0,0 +1,41 @@
+from ipaddress import ip_network
+
+import pytest
+from protonvpn_nm_lib.core.killswitch.killswitch import \
+    _exclude_from_ipv4_space
+
+
+def address_exclude(server_ip):
+    return sorted(
+        (str(subnet.network_address), subnet.prefixlen)
+        for subnet in ip_network("0.0.0.0/0").address_exclude(
+            ip_network(server_ip)
+        )
+    )
+
+
+@pytest.mark.parametrize(
+    "server_ip",
+    [
+        "0.0.0.0", "255.255.255.255", "1.2.3.4", "185.159.157.13",
+        "10.0.0.0/8", "172.16.0.0/12", "192.168.1.0/24",
+        "128.0.0.0/1", "185.159.157.12/30", "185.159.157.13/32",
+        "0.0.0.0/0"
+    ]
+)
+def test_exclude_from_ipv4_space(server_ip):
+    assert sorted(_exclude_from_ipv4_space(server_ip)) == address_exclude(
+        server_ip
+    )
+
+
+@pytest.mark.parametrize(
+    "server_ip",
+    [
+        "1.2.3.4/33", "1.2.3.4/-1", "1.2.3.5/24", "10.0.0.1/8",
+        "1.2.3", "256.0.0.1", "1.2.3.4/abc", ""
+    ]
+)
+def test_exclude_from_ipv4_space_invalid(server_ip):
+    with pytest.raises(ValueError):
+        _exclude_from_ipv4_space(server_ip)